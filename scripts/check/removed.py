@@ -1,12 +1,13 @@
 """Check if a plugin has been listed as removed."""
 
 import argparse
-import json
 import logging
 import os
 import sys
 from pathlib import Path
 
+import orjson
+
 # Loggin setup
 logging.addLevelName(logging.INFO, "")
 logging.addLevelName(logging.ERROR, "::error::")
@@ -28,20 +29,20 @@ def check_removed_repository(repo: str, data_file: str) -> None:
 
     """
     try:
-        with Path.open(data_file) as file:
-            removed_plugins = json.load(file)
+        removed_plugins = orjson.loads(Path(data_file).read_bytes())
 
-        if repo in removed_plugins:
-            logging.warning(f"⚠️ '{repo}' is removed from the RH Community Store.")
+        # Compare case-insensitively, stopping at the first match
+        if repo in map(str.lower, removed_plugins):
+            logging.warning("⚠️ '%s' is removed from the RH Community Store.", repo)
             sys.exit(1)
     except FileNotFoundError:
-        logging.exception(f"::error::Could not find {data_file}. Ensure it exists.")
-    except json.JSONDecodeError:
-        logging.exception(f"::error::Invalid JSON format in {data_file}")
+        logging.exception("::error::Could not find %s. Ensure it exists.", data_file)
+    except orjson.JSONDecodeError:
+        logging.exception("::error::Invalid JSON format in %s", data_file)
     except Exception:
         logging.exception("Unexpected error occurred")
     else:
-        logging.info(f"✅ '{repo}' is not removed from the RH Community Store.")
+        logging.info("✅ '%s' is not removed from the RH Community Store.", repo)
 
 
 if __name__ == "__main__":
@@ -1,16 +1,37 @@
 """Generate metadata for RH Community plugins."""
 
+import argparse
 import asyncio
-import base64
-import json
+import copy
 import logging
+import math
 import os
 import sys
+from collections import Counter
 from datetime import UTC, datetime
+from enum import IntEnum
+from functools import partial
 from pathlib import Path
-from time import perf_counter
+from time import monotonic, perf_counter, time
+from typing import Any
+
+import aiohttp
+import orjson
+from aiogithubapi import (
+    GitHubAPI,
+    GitHubException,
+    GitHubNotFoundException,
+    GitHubNotModifiedException,
+    GitHubRatelimitException,
+    GitHubResponseHeadersModel,
+    GitHubResponseModel,
+)
+from aiogithubapi.models.git_tree import GitHubGitTreeEntryModel
 
-from aiogithubapi import GitHubAPI, GitHubException, GitHubNotFoundException
+try:
+    import uvloop
+except ImportError:  # Not available on Windows
+    uvloop = None
 
 # Loggin setup
 logging.addLevelName(logging.INFO, "")
@@ -26,10 +47,18 @@ logging.basicConfig(
 GITHUB_TOKEN = os.getenv("GITHUB_TOKEN")
 PLUGIN_LIST_FILE = "plugins.json"
 OUTPUT_DIR = "output/plugin"
-COMPARE_IGNORE = ["last_fetched", "etag_release", "etag_repository"]
-
-# Create output directories
-Path(f"{OUTPUT_DIR}/diff").mkdir(parents=True, exist_ok=True)
+MAX_CONCURRENCY = 10
+FETCH_TIMEOUT = 20  # Seconds per GitHub API request
+RATE_LIMIT_REQUESTS = 10  # Requests allowed per period
+RATE_LIMIT_PERIOD = 1  # Period in seconds
+RATE_LIMIT_RESERVE = 50  # Pause when fewer requests remain
+RATE_LIMIT_RETRY_DELAY = 60  # Seconds to pause after a rate limit error
+CONNECTION_LIMIT = 50  # Pooled connections to the GitHub API
+DNS_CACHE_TTL = 300  # Seconds
+KEEPALIVE_TIMEOUT = 75  # Seconds
+COMPARE_IGNORE = frozenset({"last_fetched", "etag_release", "etag_repository"})
+MANIFEST_CACHE_DIR = ".cache/manifests"
+MANIFEST_CACHE_MAX_AGE = 30 * 24 * 60 * 60  # Seconds since the last cache hit
 
 
 class SummaryData:
@@ -51,24 +80,276 @@ class SummaryData:
         self.skipped = skipped
 
 
+class FetchStatus(IntEnum):
+    """Outcome of a plugin metadata fetch."""
+
+    OK = 1
+    ARCHIVED = 2
+    SKIP = 3
+
+
+type FetchResult = tuple[FetchStatus, tuple[int, dict] | None]
+
+
+class RateLimitExceededError(Exception):
+    """GitHub kept rejecting requests after the rate limit pause."""
+
+
+class RateLimiter:
+    """Token bucket limiting the rate of GitHub API requests."""
+
+    def __init__(self, reqs_per_period: int, period_in_secs: float) -> None:
+        """Initialize the rate limiter."""
+        self.capacity = reqs_per_period
+        self.rate = reqs_per_period / period_in_secs
+        self.tokens = float(reqs_per_period)
+        self.last_refill = monotonic()
+        self.resume_at = 0.0
+        self.lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Wait until a token is available for the next request."""
+        async with self.lock:
+            if (delay := self.resume_at - monotonic()) > 0:
+                await asyncio.sleep(delay)
+
+            now = monotonic()
+            elapsed = now - self.last_refill
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+            self.last_refill = now
+
+            if self.tokens < 1:
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+                self.tokens = 1
+                self.last_refill = monotonic()
+            self.tokens -= 1
+
+    def update(self, headers: GitHubResponseHeadersModel) -> None:
+        """Pause requests until the reset when the remaining rate limit runs low.
+
+        Only successful responses reach this point, aiogithubapi raises on
+        rate limited responses before their headers are available.
+
+        Args:
+        ----
+            headers: Headers of the GitHub API response.
+
+        """
+        if (
+            headers.x_ratelimit_remaining
+            and headers.x_ratelimit_reset
+            and int(headers.x_ratelimit_remaining) < RATE_LIMIT_RESERVE
+        ):
+            self.pause(int(headers.x_ratelimit_reset) - time())
+
+    def pause(self, delay: float) -> None:
+        """Hold back all requests for the given delay.
+
+        Args:
+        ----
+            delay: Seconds to wait before the next request.
+
+        """
+        if delay <= 0:
+            return
+        resume_at = monotonic() + delay
+        if resume_at > self.resume_at:
+            logging.warning("GitHub rate limit reached, pausing for %.0fs", delay)
+            self.resume_at = resume_at
+
+
+class RateLimitedGitHubAPI(GitHubAPI):
+    """GitHubAPI client sending every request through a `RateLimiter`.
+
+    Identical GET requests that are in flight at the same time share a single
+    API call.
+    """
+
+    def __init__(self, *args: Any, rate_limiter: RateLimiter, **kwargs: Any) -> None:
+        """Initialize the rate limited client."""
+        super().__init__(*args, **kwargs)
+        self.rate_limiter = rate_limiter
+        self.inflight: dict[str, asyncio.Task] = {}
+        self.waiters: Counter[asyncio.Task] = Counter()
+        self._call_api = self._client.async_call_api
+        self._client.async_call_api = self._coalesced_call_api
+
+    async def _coalesced_call_api(
+        self, *args: Any, **kwargs: Any
+    ) -> GitHubResponseModel:
+        """Join an identical GET request in flight, or start a new one."""
+        if kwargs.get("method", "GET").upper() != "GET":
+            return await self._throttled_call_api(*args, **kwargs)
+
+        key = repr((args, kwargs))
+        if (task := self.inflight.get(key)) is None:
+            task = asyncio.create_task(self._throttled_call_api(*args, **kwargs))
+            self.inflight[key] = task
+            task.add_done_callback(partial(self._request_done, key))
+        # Shield the shared call, so a cancelled caller does not cancel it
+        # for the others, and cancel it once no caller is left
+        self.waiters[task] += 1
+        try:
+            response = await asyncio.shield(task)
+        finally:
+            self.waiters[task] -= 1
+            if not self.waiters[task]:
+                del self.waiters[task]
+                task.cancel()
+        # aiogithubapi replaces `data` with a model on the response it gets,
+        # so every caller needs its own response object
+        return copy.copy(response)
+
+    def _request_done(self, key: str, task: asyncio.Task) -> None:
+        """Forget a finished request.
+
+        Args:
+        ----
+            key: Key of the request in the in-flight map.
+            task: Finished request task.
+
+        """
+        self.inflight.pop(key, None)
+        # Mark the exception as retrieved, in case every caller was cancelled
+        if not task.cancelled():
+            task.exception()
+
+    async def _throttled_call_api(
+        self, *args: Any, **kwargs: Any
+    ) -> GitHubResponseModel:
+        """Call the GitHub API once the rate limiter allows it.
+
+        A request rejected by a rate limit is retried once, after pausing all
+        requests. `RateLimitExceededError` is raised if the retry is rejected
+        as well, it is not a `GitHubException` so plugins do not handle it.
+        """
+        await self.rate_limiter.acquire()
+        try:
+            response = await self._call_api(*args, **kwargs)
+        except GitHubRatelimitException:
+            self.rate_limiter.pause(RATE_LIMIT_RETRY_DELAY)
+            await self.rate_limiter.acquire()
+            try:
+                response = await self._call_api(*args, **kwargs)
+            except GitHubRatelimitException as err:
+                msg = "GitHub rate limit still exceeded after pausing"
+                raise RateLimitExceededError(msg) from err
+        self.rate_limiter.update(response.headers)
+        return response
+
+
 class RotorHazardPlugin:
     """Handles fetching metdata for a RotorHazard plugin."""
 
-    def __init__(self, repo: str) -> None:
-        """Initialize the plugin."""
-        self.repo = repo  # Full repository name (e.g., "owner/repo_name")
+    def __init__(
+        self,
+        repo: str,
+        fetched_at: str,
+        previous: tuple[int, dict] | None = None,
+    ) -> None:
+        """Initialize the plugin.
+
+        Args:
+        ----
+            repo: Full repository name (e.g., "owner/repo_name").
+            fetched_at: ISO timestamp of the current run.
+            previous: Repository ID and metadata from the previous run, if any.
+
+        """
+        self.repo = repo
+        self.name = repo  # Plugin list entry, tags all log lines
+        self.fetched_at = fetched_at
         self.domain = None
         self.metadata = {}
         self.manifest_data = {}
-        self.etag_repository = None
-        self.etag_release = None
+        self.manifest_sha = None
+        self.previous_id, self.previous = previous or (None, {})
+        self.etag_repository = self.previous.get("etag_repository")
+        self.etag_release = self.previous.get("etag_release")
+        self.releases_response = None
+        self.events: list[tuple[str, tuple]] = []
+
+    def log_info(self, msg: str, *args: object) -> None:
+        """Record an informational event, logged later by `flush_log`.
+
+        Args:
+        ----
+            msg: Log message, with %-style placeholders.
+            args: Arguments for the placeholders.
+
+        """
+        self.events.append((msg, args))
+
+    def flush_log(self) -> None:
+        """Log all recorded informational events as a single line."""
+        if not self.events:
+            return
+        msg = "<%s> " + "; ".join(msg for msg, _ in self.events)
+        args = [arg for _, event_args in self.events for arg in event_args]
+        logging.info(msg, self.name, *args)
+        self.events.clear()
+
+    def _log(
+        self, level: int, msg: str, args: tuple, *, exc_info: bool = False
+    ) -> None:
+        """Log a message right after the events leading up to it.
+
+        Args:
+        ----
+            level: Logging level.
+            msg: Log message, with %-style placeholders.
+            args: Arguments for the placeholders.
+            exc_info: Include the current exception.
+
+        """
+        self.flush_log()
+        fmt = "<%s> " + msg
+        logging.log(level, fmt, self.name, *args, exc_info=exc_info)
+
+    def log_warning(self, msg: str, *args: object) -> None:
+        """Log a warning.
+
+        Args:
+        ----
+            msg: Log message, with %-style placeholders.
+            args: Arguments for the placeholders.
 
-    async def get_plugin_domain(self, github: GitHubAPI) -> str | None:
+        """
+        self._log(logging.WARNING, msg, args)
+
+    def log_error(self, msg: str, *args: object) -> None:
+        """Log an error.
+
+        Args:
+        ----
+            msg: Log message, with %-style placeholders.
+            args: Arguments for the placeholders.
+
+        """
+        self._log(logging.ERROR, msg, args)
+
+    def log_exception(self, msg: str, *args: object) -> None:
+        """Log an error with the current exception.
+
+        Args:
+        ----
+            msg: Log message, with %-style placeholders.
+            args: Arguments for the placeholders.
+
+        """
+        self._log(logging.ERROR, msg, args, exc_info=True)
+
+    async def get_plugin_domain(self, github: GitHubAPI, branch: str) -> str | None:
         """Fetch the folder name (domain) from the `custom_plugins/` folder.
 
+        The whole repository tree is fetched in a single recursive call, which
+        also provides the blob SHA of the domain's `manifest.json`. When GitHub
+        truncates that tree, only the `custom_plugins/` subtree is fetched.
+
         Args:
         ----
             github: GitHubAPI instance.
+            branch: Branch to read the repository tree from.
 
         Returns:
         -------
@@ -76,48 +357,128 @@ class RotorHazardPlugin:
 
         """
         try:
-            logging.info(f"<{self.repo}> Fetching plugin domain")
-            response = await github.repos.contents.get(
-                self.repo, etag=self.etag_repository
+            self.log_info("Fetching plugin domain")
+            response = await github.repos.git.get_tree(
+                self.repo, branch, params={"recursive": "1"}
             )
+            tree = response.data.tree
+            if response.data.truncated:
+                self.log_info("Repository tree is truncated")
+                tree = await self.fetch_custom_plugins_tree(github, branch)
+
+            # Collect the domain folders and manifests inside `custom_plugins/`
+            custom_plugins_folder = False
+            subfolders = []
+            manifests = {}
+            for item in tree:
+                parts = item.path.split("/")
+                if parts[0] != "custom_plugins":
+                    continue
+                if len(parts) == 1:
+                    custom_plugins_folder = item.type == "tree"
+                elif len(parts) == 2 and item.type == "tree":
+                    subfolders.append(parts[1])
+                elif len(parts) == 3 and parts[2] == "manifest.json":
+                    manifests[parts[1]] = item.sha
 
-            # Check for `custom_plugins/` folder
-            custom_plugins_folder = next(
-                (
-                    item
-                    for item in response.data
-                    if item.name == "custom_plugins" and item.type == "dir"
-                ),
-                None,
-            )
             if not custom_plugins_folder:
-                logging.error(f"<{self.repo}> The `custom_plugins/` folder is missing")
+                self.log_error("The `custom_plugins/` folder is missing")
                 return None
 
-            # Fetch the contens of the `custom_plugins/` folder
-            folder_response = await github.repos.contents.get(
-                self.repo, "custom_plugins"
-            )
-            subfolders = [item for item in folder_response.data if item.type == "dir"]
-
             # Ensure there is exactly one domain folder
             if len(subfolders) != 1:
-                logging.error(
-                    f"<{self.repo}> Expected exactly one domain folder inside "
-                    f"`custom_plugins/` but found: {len(subfolders)}."
+                self.log_error(
+                    "Expected exactly one domain folder inside "
+                    "`custom_plugins/` but found: %d.",
+                    len(subfolders),
                 )
                 return None
 
             # Get the domain folder name
-            self.domain = subfolders[0].name
-            logging.info(f"<{self.repo}> Found domain '{self.domain}'")
+            self.domain = subfolders[0]
+            self.manifest_sha = manifests.get(self.domain)
+            self.log_info("Found domain '%s'", self.domain)
         except GitHubNotFoundException:
-            logging.warning(f"<{self.repo}> Repository not found")
+            self.log_warning("Repository not found")
         except GitHubException:
-            logging.exception(f"<{self.repo}> Error fetching plugin domain")
+            self.log_exception("Error fetching plugin domain")
         else:
             return self.domain
 
+    async def fetch_custom_plugins_tree(
+        self, github: GitHubAPI, branch: str
+    ) -> list[GitHubGitTreeEntryModel]:
+        """Fetch the `custom_plugins/` folder and everything inside it.
+
+        Args:
+        ----
+            github: GitHubAPI instance.
+            branch: Branch to read the repository tree from.
+
+        Returns:
+        -------
+            list[GitHubGitTreeEntryModel]: Tree entries with paths relative to the
+                repository root, or only the root entries if the folder is missing.
+
+        """
+        root = await github.repos.git.get_tree(self.repo, branch)
+        folder = next(
+            (
+                item
+                for item in root.data.tree
+                if item.path == "custom_plugins" and item.type == "tree"
+            ),
+            None,
+        )
+        if folder is None:
+            return root.data.tree
+
+        subtree = await github.repos.git.get_tree(
+            self.repo, folder.sha, params={"recursive": "1"}
+        )
+        if subtree.data.truncated:
+            self.log_warning("The `custom_plugins/` tree is truncated")
+        for item in subtree.data.tree:
+            item.path = f"custom_plugins/{item.path}"
+        return [folder, *subtree.data.tree]
+
+    def load_cached_manifest(self) -> dict | None:
+        """Load the manifest from the disk cache.
+
+        Blob SHAs are content addresses, so a cached manifest never goes stale.
+        A hit refreshes the file's modification time to keep it from being pruned.
+
+        Returns
+        -------
+            dict | None: Cached manifest, or None if it is not cached.
+
+        """
+        cache_file = Path(MANIFEST_CACHE_DIR) / f"{self.manifest_sha}.json"
+        try:
+            manifest = orjson.loads(cache_file.read_bytes())
+            cache_file.touch()
+        except (OSError, orjson.JSONDecodeError):
+            return None
+        self.log_info("Using cached manifest")
+        return manifest
+
+    def save_cached_manifest(self, manifest: dict) -> None:
+        """Store the manifest in the disk cache.
+
+        Args:
+        ----
+            manifest: Parsed manifest data.
+
+        """
+        cache_dir = Path(MANIFEST_CACHE_DIR)
+        try:
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            (cache_dir / f"{self.manifest_sha}.json").write_bytes(
+                orjson.dumps(manifest)
+            )
+        except OSError:
+            self.log_warning("Could not cache manifest")
+
     async def validate_manifest_domain(self, github: GitHubAPI) -> bool:
         """Validate that the domain in `manifest.json` matches the folder name.
 
@@ -134,41 +495,64 @@ class RotorHazardPlugin:
             return False
 
         manifest_path = f"custom_plugins/{self.domain}/manifest.json"
-        try:
-            response = await github.repos.contents.get(self.repo, manifest_path)
+        if not self.manifest_sha:
+            self.log_error("Manifest file not found at '%s'", manifest_path)
+            return False
 
-            # Decode Base64 content manually
-            manifest = json.loads(
-                base64.b64decode(response.data.content).decode("utf-8")
-            )
+        try:
+            manifest = self.load_cached_manifest()
+            if manifest is None:
+                # Request the raw blob to skip the Base64 encoded JSON envelope
+                response = await github.generic(
+                    f"/repos/{self.repo}/git/blobs/{self.manifest_sha}",
+                    headers={"Accept": "application/vnd.github.raw"},
+                )
+                manifest = orjson.loads(response.data)
+                self.save_cached_manifest(manifest)
             self.manifest_data = manifest
             manifest_domain = manifest.get("domain")
 
             # Compare the domain in the manifest with the folder name
             if manifest_domain != self.domain:
-                logging.error(
-                    f"<{self.repo}> Domain mismatch: Folder "
-                    f"'{self.domain}' vs Manifest '{manifest_domain}'"
+                self.log_error(
+                    "Domain mismatch: Folder '%s' vs Manifest '%s'",
+                    self.domain,
+                    manifest_domain,
                 )
                 return False
         except GitHubNotFoundException:
-            logging.exception(
-                f"<{self.repo}> Manifest file not found at '{manifest_path}'"
-            )
-        except json.JSONDecodeError:
-            logging.exception(
-                f"<{self.repo}> Manifest file at '{manifest_path}' "
-                "contains invalid JSON"
+            self.log_exception("Manifest file not found at '%s'", manifest_path)
+        except orjson.JSONDecodeError:
+            self.log_exception(
+                "Manifest file at '%s' contains invalid JSON",
+                manifest_path,
             )
         except GitHubException:
-            logging.exception(f"Error fetching manifest for '{self.repo}'")
+            self.log_exception("Error fetching manifest")
         else:
-            logging.info(
-                f"<{self.repo}> Domain validated: '{self.domain}' "
-                "matches manifest domain."
+            self.log_info(
+                "Domain validated: '%s' matches manifest domain",
+                self.domain,
             )
             return True
 
+    async def fetch_manifest(self, github: GitHubAPI, branch: str) -> bool:
+        """Fetch the plugin domain and validate it against `manifest.json`.
+
+        Args:
+        ----
+            github: GitHubAPI instance.
+            branch: Branch to read the repository tree from.
+
+        Returns:
+        -------
+            bool: True if a valid domain and manifest were found, False otherwise.
+
+        """
+        if not await self.get_plugin_domain(github, branch):
+            return False
+        return await self.validate_manifest_domain(github)
+
     async def validate_manifest_version(
         self,
         last_version: str | None,
@@ -191,11 +575,11 @@ class RotorHazardPlugin:
             """Remove 'v' prefix from version strings."""
             return version.lstrip("v") if version else None
 
-        logging.info(f"<{self.repo}> Validating manifest version")
+        self.log_info("Validating manifest version")
         manifest_version = self.manifest_data.get("version")
 
         if not manifest_version:
-            logging.error(f"<{self.repo}> Manifest version is missing")
+            self.log_error("Manifest version is missing")
             return False
 
         last_version = normalize_version(last_version)
@@ -206,18 +590,29 @@ class RotorHazardPlugin:
             return True
 
         # Mismatch - version is outdated
-        warning_message = (
-            f"<{self.repo}> Version mismatch: '{manifest_version}' "
-            f"(manifest) vs '{last_version}' (latest stable)"
-        )
         if prerelease_version:
-            warning_message += f", '{prerelease_version}' (prerelease)"
-        logging.warning(warning_message)
+            self.log_warning(
+                "Version mismatch: '%s' (manifest) vs '%s' (latest stable), "
+                "'%s' (prerelease)",
+                manifest_version,
+                last_version,
+                prerelease_version,
+            )
+        else:
+            self.log_warning(
+                "Version mismatch: '%s' (manifest) vs '%s' (latest stable)",
+                manifest_version,
+                last_version,
+            )
         return False
 
     async def fetch_releases(self, github: GitHubAPI) -> tuple[str | None, str | None]:
         """Fetch the latest release tag from GitHub.
 
+        When the releases are unchanged since the previous run, the versions of
+        the previous run are reused. A listing already fetched by
+        `releases_modified` is used instead of requesting it again.
+
         Args:
         ----
             github: GitHubAPI instance.
@@ -227,39 +622,81 @@ class RotorHazardPlugin:
             tuple[str | None, str | None]: Latest release and prerelease.
 
         """
-        logging.info(f"<{self.repo}> Fetching releases")
+        self.log_info("Fetching releases")
         try:
-            releases = await github.repos.releases.list(self.repo)
+            releases = self.releases_response or await github.repos.releases.list(
+                self.repo, etag=self.etag_release
+            )
             if releases.etag:
                 self.etag_release = releases.etag
 
             if not releases.data:
-                logging.warning(f"<{self.repo}> No releases found")
+                self.log_warning("No releases found")
                 return None, None
 
-            # Ensure releases are sorted by creation date (newest first)
-            sorted_releases = sorted(
-                releases.data, key=lambda r: r.created_at, reverse=True
-            )
-            # Extract latest stable and prerelease versions
-            latest_release = next(
-                (r.tag_name for r in sorted_releases if not r.prerelease), None
-            )
-            latest_prerelease = next(
-                (r.tag_name for r in sorted_releases if r.prerelease), None
-            )
+            # Extract latest stable and prerelease versions in a single pass,
+            # GitHub already lists releases newest first
+            latest_release = latest_prerelease = None
+            for release in releases.data:
+                if release.prerelease:
+                    latest_prerelease = latest_prerelease or release.tag_name
+                else:
+                    latest_release = latest_release or release.tag_name
+                if latest_release and latest_prerelease:
+                    break
 
-            logging.info(f"<{self.repo}> Latest stable release: {latest_release}")
+            self.log_info("Latest stable release: %s", latest_release)
             if latest_prerelease:
-                logging.info(f"<{self.repo}> Latest prerelease: {latest_prerelease}")
+                self.log_info("Latest prerelease: %s", latest_prerelease)
+        except GitHubNotModifiedException:
+            self.log_info("Releases unchanged, reusing versions")
+            previous = self.previous
+            return previous.get("last_version"), previous.get("last_prerelease")
         except GitHubNotFoundException:
-            logging.warning(f"<{self.repo}> Zero github releases found")
+            self.log_warning("Zero github releases found")
         except GitHubException:
-            logging.exception(f"<{self.repo}> Error fetching releases")
+            self.log_exception("Error fetching releases")
         else:
             return latest_release, latest_prerelease
+        return None, None
+
+    async def releases_modified(self, github: GitHubAPI) -> bool:
+        """Check if the releases changed since the previous run.
+
+        Args:
+        ----
+            github: GitHubAPI instance.
+
+        Returns:
+        -------
+            bool: False if GitHub reports the releases as not modified.
+
+        """
+        try:
+            self.releases_response = await github.repos.releases.list(
+                self.repo, etag=self.etag_release
+            )
+        except GitHubNotModifiedException:
+            return False
+        return True
+
+    def reuse_previous_metadata(self) -> tuple[int, dict]:
+        """Reuse the metadata of the previous run for an unchanged repository.
+
+        Returns
+        -------
+            tuple[int, dict]: Repository ID and previous plugin metadata with a
+                refreshed fetch time.
+
+        """
+        self.log_info("Repository unchanged, reusing metadata")
+        self.metadata = {
+            **self.previous,
+            "last_fetched": self.fetched_at,
+        }
+        return self.previous_id, self.metadata
 
-    async def fetch_metadata(self, github: GitHubAPI) -> dict | str | None:
+    async def fetch_metadata(self, github: GitHubAPI) -> FetchResult:
         """Fetch and update the plugin's metadata.
 
         Args:
@@ -268,60 +705,53 @@ class RotorHazardPlugin:
 
         Returns:
         -------
-            dict | str | None: Plugin metadata if successful, "archived" if archived,
+            FetchResult: `FetchStatus.OK` with the repository ID and plugin
+                metadata if successful, `FetchStatus.ARCHIVED` or
+                `FetchStatus.SKIP` without a payload otherwise.
 
         """
         try:
-            logging.info(f"<{self.repo}> Fetching repository metadata")
-            repo_data = await github.repos.get(self.repo)
+            self.log_info("Fetching repository metadata")
+            try:
+                repo_data = await github.repos.get(self.repo, etag=self.etag_repository)
+            except GitHubNotModifiedException:
+                if not await self.releases_modified(github):
+                    return FetchStatus.OK, self.reuse_previous_metadata()
+                repo_data = await github.repos.get(self.repo)
 
             # Check if the repository is archived
             if repo_data.data.archived:
-                logging.error(f"<{self.repo}> Repository is archived")
-                return "archived"
+                self.log_error("Repository is archived")
+                return FetchStatus.ARCHIVED, None
 
             # Check if the repository has been renamed
             full_name = repo_data.data.full_name
             if full_name.lower() != self.repo.lower():
-                logging.error(
-                    f"<{self.repo}> Repository has been renamed to '{full_name}'"
-                )
+                self.log_error("Repository has been renamed to '%s'", full_name)
                 self.repo = full_name  # Update the repo name
 
-            # Fetch plugin domain
-            if not await self.get_plugin_domain(github):
-                return None
-
-            # Validate domain and manifest
-            if not await self.validate_manifest_domain(github):
-                return None
+            # Fetch the manifest and the releases concurrently, a failure in
+            # one cancels the other so nothing outlives this plugin's fetch
+            try:
+                async with asyncio.TaskGroup() as group:
+                    manifest_task = group.create_task(
+                        self.fetch_manifest(github, repo_data.data.default_branch)
+                    )
+                    releases_task = group.create_task(self.fetch_releases(github))
+            except ExceptionGroup as errors:
+                raise errors.exceptions[0]  # noqa: B904
+            if not manifest_task.result():
+                return FetchStatus.SKIP, None
+            last_version, last_prerelease_version = releases_task.result()
 
             # Fetch rest of the metadata
             if repo_data.etag:
                 self.etag_repository = repo_data.etag
-            last_version, last_prerelease_version = await self.fetch_releases(github)
 
             # Validate manifest version against github releases
             await self.validate_manifest_version(last_version, last_prerelease_version)
 
-            self.metadata = {
-                "etag_release": self.etag_release,
-                "etag_repository": self.etag_repository,
-                "last_fetched": datetime.now(UTC).isoformat(),
-                "last_updated": repo_data.data.updated_at,
-                "last_version": last_version,
-                "open_issues": repo_data.data.open_issues_count,
-                "repository": self.repo,
-                "stargazers_count": repo_data.data.stargazers_count,
-                "topics": repo_data.data.topics,
-            }
-
-            # Add prerelease version if available
-            if last_prerelease_version:
-                self.metadata["last_prerelease"] = last_prerelease_version
-            self.metadata = dict(sorted(self.metadata.items()))
-
-            # Add manifest-specific metadata
+            # Build the metadata once, with the keys in their output order
             self.metadata = {
                 "manifest": {
                     "name": self.manifest_data.get("name"),
@@ -333,42 +763,103 @@ class RotorHazardPlugin:
                     },
                 },
                 "domain": self.domain,
-                **self.metadata,
+                "etag_release": self.etag_release,
+                "etag_repository": self.etag_repository,
+                "last_fetched": self.fetched_at,
+                "last_prerelease": last_prerelease_version,
+                "last_updated": repo_data.data.updated_at,
+                "last_version": last_version,
+                "open_issues": repo_data.data.open_issues_count,
+                "repository": self.repo,
+                "stargazers_count": repo_data.data.stargazers_count,
+                "topics": repo_data.data.topics,
             }
+
+            # Only list the prerelease version if available
+            if not last_prerelease_version:
+                del self.metadata["last_prerelease"]
         except GitHubNotFoundException:
-            logging.warning(f"<{self.repo}> Repository not found")
+            self.log_warning("Repository not found")
         except GitHubException:
-            logging.exception(f"<{self.repo}> Error fetching repository metadata")
+            self.log_exception("Error fetching repository metadata")
         else:
-            logging.info(f"<{self.repo}> Metadata successfully generated")
-            return {repo_data.data.id: self.metadata}
+            self.log_info("Metadata successfully generated")
+            return FetchStatus.OK, (repo_data.data.id, self.metadata)
+        return FetchStatus.SKIP, None
 
 
 class MetadataGenerator:
     """Handles generating and saving metadata for all repositories."""
 
-    def __init__(self, plugin_file: str, output_dir: str) -> None:
+    def __init__(
+        self,
+        plugin_file: str,
+        output_dir: str,
+        max_concurrency: int = MAX_CONCURRENCY,
+        fetch_timeout: float = FETCH_TIMEOUT,
+    ) -> None:
         """Initialize the metadata generator."""
         self.plugin_file = Path(plugin_file)
-        self.output_dir = output_dir
+        self.output_dir = Path(output_dir)
+        self.diff_dir = self.output_dir / "diff"
+        self.diff_dir.mkdir(parents=True, exist_ok=True)
+        self.data_path = self.output_dir / "data.json"
+        self.after_path = self.diff_dir / "after.json"
+        self.repositories_path = self.output_dir / "repositories.json"
+        self.summary_path = self.output_dir / "summary.json"
         self.repos_list = self.load_repos()
+        self.previous = self.load_previous()
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.fetch_timeout = fetch_timeout
+        self.fetched_at = datetime.now(UTC).isoformat()
 
     def load_repos(self) -> list[str]:
         """Load repository list from the plugin file.
 
+        Repositories listed more than once, in any letter case, are only
+        fetched once under their first spelling.
+
         Returns
         -------
             list[str]: List of repositories.
 
         """
-        if self.plugin_file.exists():
-            with Path.open(self.plugin_file, encoding="utf-8") as f:
-                return json.load(f)
-        else:
+        try:
+            data = self.plugin_file.read_bytes()
+        except FileNotFoundError:
             logging.warning("Plugin list file not found. Using an empty list.")
             return []
 
-    def save_filtered_json(self, filepath: str, data: dict) -> None:
+        repos: dict[str, str] = {}
+        for repo in orjson.loads(data):
+            if repo.lower() in repos:
+                logging.warning("<%s> Duplicate plugin list entry, skipping", repo)
+                continue
+            repos[repo.lower()] = repo
+        return list(repos.values())
+
+    def load_previous(self) -> dict[str, tuple[int, dict]]:
+        """Load the metadata generated by the previous run.
+
+        Returns
+        -------
+            dict[str, tuple[int, dict]]: Repository ID and metadata, keyed by
+                lowercase repository name.
+
+        """
+        try:
+            data = orjson.loads(self.data_path.read_bytes())
+        except FileNotFoundError:
+            return {}
+        except orjson.JSONDecodeError:
+            logging.warning("Previous metadata contains invalid JSON. Ignoring it.")
+            return {}
+        return {
+            metadata["repository"].lower(): (int(repo_id), metadata)
+            for repo_id, metadata in data.items()
+        }
+
+    def _save_filtered_json_sync(self, filepath: Path, data: dict) -> None:
         """Save data to a JSON file with filtered keys.
 
         Args:
@@ -381,10 +872,9 @@ class MetadataGenerator:
             key: {k: v for k, v in value.items() if k not in COMPARE_IGNORE}
             for key, value in data.items()
         }
-        with Path.open(filepath, "w", encoding="utf-8") as f:
-            json.dump(filtered_data, f, indent=2)
+        self._save_json_sync(filepath, filtered_data)
 
-    def save_json(self, filepath: str, data: dict) -> None:
+    def _save_json_sync(self, filepath: Path, data: dict) -> None:
         """Save data to a JSON file.
 
         Args:
@@ -393,8 +883,77 @@ class MetadataGenerator:
             data: Data to be saved.
 
         """
-        with Path.open(filepath, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2)
+        filepath.write_bytes(
+            orjson.dumps(
+                data,
+                option=orjson.OPT_INDENT_2
+                | orjson.OPT_NON_STR_KEYS
+                | orjson.OPT_APPEND_NEWLINE,
+            )
+        )
+
+    async def save_filtered_json(self, filepath: Path, data: dict) -> None:
+        """Save data to a JSON file with filtered keys, off the event loop.
+
+        Args:
+        ----
+            filepath: Path to the output JSON file.
+            data: Data to be saved.
+
+        """
+        await asyncio.to_thread(self._save_filtered_json_sync, filepath, data)
+
+    async def save_json(self, filepath: Path, data: dict) -> None:
+        """Save data to a JSON file, off the event loop.
+
+        Args:
+        ----
+            filepath: Path to the output JSON file.
+            data: Data to be saved.
+
+        """
+        await asyncio.to_thread(self._save_json_sync, filepath, data)
+
+    def prune_manifest_cache(self) -> None:
+        """Remove cached manifests that have not been used for a while.
+
+        Plugins reusing the previous metadata never read their manifest, so
+        entries are kept for `MANIFEST_CACHE_MAX_AGE` after their last hit
+        instead of only for the current run.
+        """
+        expired = time() - MANIFEST_CACHE_MAX_AGE
+        pruned = 0
+        for cache_file in Path(MANIFEST_CACHE_DIR).glob("*.json"):
+            try:
+                if cache_file.stat().st_mtime < expired:
+                    cache_file.unlink()
+                    pruned += 1
+            except OSError:
+                logging.warning("Could not prune cached manifest %s", cache_file)
+        if pruned:
+            logging.info("Pruned %d unused cached manifests", pruned)
+
+    async def fetch_plugin(self, github: GitHubAPI, repo: str) -> FetchResult:
+        """Fetch the metadata of a plugin, bounded by the concurrency limit.
+
+        Args:
+        ----
+            github: GitHubAPI instance.
+            repo: Full repository name.
+
+        Returns:
+        -------
+            FetchResult: Result of `RotorHazardPlugin.fetch_metadata`.
+
+        """
+        async with self.semaphore:
+            plugin = RotorHazardPlugin(
+                repo, self.fetched_at, self.previous.get(repo.lower())
+            )
+            try:
+                return await plugin.fetch_metadata(github)
+            finally:
+                plugin.flush_log()
 
     async def summarize_results(
         self,
@@ -421,12 +980,11 @@ class MetadataGenerator:
             "skipped_plugins": summary_data.skipped,
             "execution_time_seconds": round(elapsed_time, 2),
         }
-        summary_path = f"{self.output_dir}/summary.json"
-        self.save_json(summary_path, summary)
+        await self.save_json(self.summary_path, summary)
 
     async def generate_metadata(self) -> None:
         """Generate metadata for all repositories."""
-        plugin_data: dict[str, dict] = {}
+        plugin_data: dict[int, dict] = {}
         valid_repositories: list[str] = []
         skipped_plugins = 0
         archived_plugins = 0
@@ -434,35 +992,68 @@ class MetadataGenerator:
 
         start_time = perf_counter()
 
-        async with GitHubAPI(token=GITHUB_TOKEN) as github:
-            tasks = [
-                RotorHazardPlugin(repo).fetch_metadata(github)
-                for repo in self.repos_list
-            ]
-            results = await asyncio.gather(*tasks)
-
-            for result in results:
-                if result == "archived":
-                    archived_plugins += 1
-                elif result:
-                    repo_id, metadata = next(iter(result.items()))
-                    plugin_data[repo_id] = metadata
-                    valid_repositories.append(metadata["repository"])
-                    # Check if the repository name was updated
-                    if (
-                        metadata["repository"]
-                        != self.repos_list[
-                            valid_repositories.index(metadata["repository"])
-                        ]
-                    ):
-                        renamed_plugins += 1
-                else:
-                    skipped_plugins += 1
-
-        # Save generated metadata to local JSON file
-        self.save_filtered_json(f"{self.output_dir}/diff/after.json", plugin_data)
-        self.save_json(f"{self.output_dir}/data.json", plugin_data)
-        self.save_json(f"{self.output_dir}/repositories.json", valid_repositories)
+        rate_limiter = RateLimiter(RATE_LIMIT_REQUESTS, RATE_LIMIT_PERIOD)
+        connector = aiohttp.TCPConnector(
+            limit=CONNECTION_LIMIT,
+            ttl_dns_cache=DNS_CACHE_TTL,
+            keepalive_timeout=KEEPALIVE_TIMEOUT,
+        )
+        async with (
+            aiohttp.ClientSession(connector=connector) as session,
+            # The timeout applies to each request on its own, so time spent
+            # waiting on the rate limiter never counts against it
+            RateLimitedGitHubAPI(
+                token=GITHUB_TOKEN,
+                session=session,
+                rate_limiter=rate_limiter,
+                timeout=self.fetch_timeout,
+            ) as github,
+        ):
+            tasks = {
+                asyncio.create_task(self.fetch_plugin(github, repo)): (index, repo)
+                for index, repo in enumerate(self.repos_list)
+            }
+            completed: dict[int, tuple[int, dict]] = {}
+
+            # Process each plugin as soon as it finishes instead of waiting
+            # for the slowest one
+            async for task in asyncio.as_completed(tasks):
+                index, repo = tasks[task]
+                result = task.exception() or task.result()
+                match result:
+                    case RateLimitExceededError():
+                        # Abort instead of publishing a partial catalog
+                        logging.error("<%s> %s, aborting", repo, result)
+                        for pending in tasks:
+                            pending.cancel()
+                        await asyncio.gather(*tasks, return_exceptions=True)
+                        raise result
+                    case BaseException():
+                        logging.warning("<%s> Skipped: %r", repo, result)
+                        skipped_plugins += 1
+                    case (FetchStatus.OK, (repo_id, metadata)):
+                        completed[index] = repo_id, metadata
+                    case (FetchStatus.ARCHIVED, _):
+                        archived_plugins += 1
+                    case _:
+                        skipped_plugins += 1
+
+        # Keep the output in plugin list order, regardless of completion order
+        for index in sorted(completed):
+            repo_id, metadata = completed[index]
+            plugin_data[repo_id] = metadata
+            valid_repositories.append(metadata["repository"])
+            # Check if the repository name was updated
+            if metadata["repository"].lower() != self.repos_list[index].lower():
+                renamed_plugins += 1
+
+        # Save generated metadata to local JSON files
+        await asyncio.gather(
+            self.save_filtered_json(self.after_path, plugin_data),
+            self.save_json(self.data_path, plugin_data),
+            self.save_json(self.repositories_path, valid_repositories),
+        )
+        self.prune_manifest_cache()
 
         # Summarize the results
         summary_data = SummaryData(
@@ -475,5 +1066,65 @@ class MetadataGenerator:
         await self.summarize_results(summary_data, start_time)
 
 
+def positive_int(value: str) -> int:
+    """Parse a strictly positive integer command line argument.
+
+    Args:
+    ----
+        value: Raw argument value.
+
+    Returns:
+    -------
+        int: Parsed value.
+
+    """
+    number = int(value)
+    if number < 1:
+        msg = f"must be a positive integer, got {value}"
+        raise argparse.ArgumentTypeError(msg)
+    return number
+
+
+def positive_float(value: str) -> float:
+    """Parse a strictly positive, finite number command line argument.
+
+    Args:
+    ----
+        value: Raw argument value.
+
+    Returns:
+    -------
+        float: Parsed value.
+
+    """
+    number = float(value)
+    if not 0 < number < math.inf:
+        msg = f"must be a positive number, got {value}"
+        raise argparse.ArgumentTypeError(msg)
+    return number
+
+
 if __name__ == "__main__":
-    asyncio.run(MetadataGenerator(PLUGIN_LIST_FILE, OUTPUT_DIR).generate_metadata())
+    parser = argparse.ArgumentParser(description="Generate plugin metadata.")
+    parser.add_argument(
+        "--max-concurrency",
+        type=positive_int,
+        default=MAX_CONCURRENCY,
+        help="Maximum number of plugins fetched from GitHub at the same time.",
+    )
+    parser.add_argument(
+        "--fetch-timeout",
+        type=positive_float,
+        default=FETCH_TIMEOUT,
+        help="Maximum time in seconds for a single GitHub API request.",
+    )
+    args = parser.parse_args()
+
+    generator = MetadataGenerator(
+        PLUGIN_LIST_FILE,
+        OUTPUT_DIR,
+        max_concurrency=args.max_concurrency,
+        fetch_timeout=args.fetch_timeout,
+    )
+    run = uvloop.run if uvloop else asyncio.run
+    run(generator.generate_metadata())
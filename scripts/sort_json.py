@@ -6,6 +6,8 @@ import logging
 import sys
 from pathlib import Path
 
+import orjson
+
 # Loggin setup
 logging.addLevelName(logging.INFO, "")
 logging.addLevelName(logging.ERROR, "::error::")
@@ -17,6 +19,24 @@ logging.basicConfig(
 )
 
 
+def list_sort_key(item: object) -> str:
+    """Get the sort key of a JSON list item.
+
+    Args:
+    ----
+        item (object): List item.
+
+    Returns:
+    -------
+        str: The item itself for strings, its JSON form otherwise.
+
+    """
+    if isinstance(item, str):
+        return item
+    # Keep json.dumps: its escaping and separators define the existing order
+    return json.dumps(item)
+
+
 def sort_json(  # noqa: PLR0911
     file_path: Path,
     check_only: bool = False,  # noqa: FBT001, FBT002
@@ -34,43 +54,49 @@ def sort_json(  # noqa: PLR0911
 
     """
     try:
-        with Path.open(file_path) as file:
-            data = json.load(file)
+        data = orjson.loads(file_path.read_bytes())
 
         # Check if on list or dict
         if isinstance(data, list):
-            sorted_data = sorted(
-                data, key=lambda x: x if isinstance(x, str) else json.dumps(x)
-            )
+            sorted_data = sorted(data, key=list_sort_key)
         elif isinstance(data, dict):
-            sorted_data = {k: data[k] for k in sorted(data)}
+            sorted_data = dict(sorted(data.items()))
         else:
             logging.warning(
-                f"⚠️ Invalid format in {file_path}: Only lists and dicts are supported."
+                "⚠️ Invalid format in %s: Only lists and dicts are supported.",
+                file_path,
             )
             return False
 
+        # Compare the order of list items or dict keys, dicts compare equal
+        # regardless of their key order
+        is_sorted = list(data) == list(sorted_data)
+
         if check_only:
             # Validate if the file is sorted
-            if data != sorted_data:
-                logging.error(f"❌ {file_path} is not sorted.")
+            if not is_sorted:
+                logging.error("❌ %s is not sorted.", file_path)
                 return False
-            logging.info(f"✅ {file_path} is already sorted.")
+            logging.info("✅ %s is already sorted.", file_path)
             return True
 
         # Write sorted data to file
-        if data != sorted_data:
-            with Path.open(file_path, "w") as file:
-                json.dump(sorted_data, file, indent=2)
-                file.write("\n")  # Add newline at the end of the file
-            logging.info(f"🧹 {file_path} has been sorted.")
+        if not is_sorted:
+            file_path.write_bytes(
+                orjson.dumps(
+                    sorted_data,
+                    # Add newline at the end of the file
+                    option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE,
+                )
+            )
+            logging.info("🧹 %s has been sorted.", file_path)
             return True
-        logging.info(f"✅ {file_path} was already sorted. No changes made.")
-    except json.JSONDecodeError:
-        logging.exception(f"❌ Invalid JSON in {file_path}")
+        logging.info("✅ %s was already sorted. No changes made.", file_path)
+    except orjson.JSONDecodeError:
+        logging.exception("❌ Invalid JSON in %s", file_path)
         return False
     except Exception:
-        logging.exception(f"❌ Could not process {file_path}")
+        logging.exception("❌ Could not process %s", file_path)
         return False
     else:
         return True
@@ -89,7 +115,7 @@ def main() -> None:
     for file in args.files:
         file_path = Path(file)
         if not file_path.exists():
-            logging.error(f"❌ File not found: {file}")
+            logging.error("❌ File not found: %s", file)
             all_sorted = False
             continue
 
@@ -0,0 +1 @@
+"""Tests for the RH Community Store scripts."""
@@ -0,0 +1,351 @@
+"""Tests for the metadata generator."""
+
+import asyncio
+import tempfile
+import unittest
+from functools import partial
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+import aiohttp
+from aiogithubapi import (
+    GitHubGitTreeModel,
+    GitHubReleaseModel,
+    GitHubRepositoryModel,
+)
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from scripts.generate_metadata import (
+    FetchStatus,
+    MetadataGenerator,
+    RateLimitedGitHubAPI,
+    RateLimiter,
+    RateLimitExceededError,
+    RotorHazardPlugin,
+)
+
+FETCHED_AT = "2025-01-01T00:00:00+00:00"
+REPOSITORY = {"id": 1, "full_name": "owner/repo", "default_branch": "main"}
+RELEASES = [{"tag_name": "v1.0.0", "prerelease": False}]
+TREE = {"sha": "abc", "tree": [{"path": "custom_plugins", "type": "tree"}]}
+MANIFEST = {"domain": "demo", "name": "Demo", "version": "1.0.0"}
+REPOSITORY_ETAG = '"repository"'
+RELEASES_ETAG = '"releases"'
+PREVIOUS = {
+    "domain": "demo",
+    "etag_release": '"old-releases"',
+    "etag_repository": REPOSITORY_ETAG,
+    "last_fetched": "2024-01-01T00:00:00+00:00",
+    "last_version": "v0.9.0",
+    "repository": "owner/repo",
+}
+RECURSIVE_TREE = {
+    "sha": "abc",
+    "truncated": False,
+    "tree": [
+        {"path": "custom_plugins", "type": "tree", "sha": "plugins"},
+        {"path": "custom_plugins/demo", "type": "tree", "sha": "demo"},
+        {"path": "custom_plugins/demo/manifest.json", "type": "blob", "sha": "m"},
+    ],
+}
+TRUNCATED_TREE = {
+    "sha": "abc",
+    "truncated": True,
+    "tree": [{"path": "README.md", "type": "blob", "sha": "readme"}],
+}
+ROOT_TREE = {
+    "sha": "abc",
+    "truncated": False,
+    "tree": [
+        {"path": "README.md", "type": "blob", "sha": "readme"},
+        {"path": "custom_plugins", "type": "tree", "sha": "plugins"},
+    ],
+}
+PLUGINS_TREE = {
+    "sha": "plugins",
+    "truncated": False,
+    "tree": [
+        {"path": "demo", "type": "tree", "sha": "demo"},
+        {"path": "demo/manifest.json", "type": "blob", "sha": "m"},
+    ],
+}
+
+
+class TestRequestCoalescing(unittest.IsolatedAsyncioTestCase):
+    """Identical concurrent requests share a single API call."""
+
+    async def asyncSetUp(self) -> None:
+        """Start a fake GitHub API server."""
+        self.calls: list[str] = []
+        app = web.Application()
+        app.router.add_get("/repos/owner/repo", self.respond(REPOSITORY))
+        app.router.add_get("/repos/owner/repo/releases", self.respond(RELEASES))
+        app.router.add_get("/repos/owner/repo/git/trees/main", self.respond(TREE))
+        self.server = TestServer(app)
+        await self.server.start_server()
+        self.session = aiohttp.ClientSession()
+        self.github = RateLimitedGitHubAPI(
+            session=self.session,
+            rate_limiter=RateLimiter(10, 1),
+            base_url=str(self.server.make_url("")).rstrip("/"),
+        )
+
+    async def asyncTearDown(self) -> None:
+        """Stop the fake GitHub API server."""
+        await self.session.close()
+        await self.server.close()
+
+    def respond(self, data: dict | list) -> web.RequestHandler:
+        """Create a handler answering slowly enough for requests to overlap."""
+
+        async def handler(request: web.Request) -> web.Response:
+            self.calls.append(request.path)
+            await asyncio.sleep(0.1)
+            return web.json_response(data)
+
+        return handler
+
+    async def test_repository(self) -> None:
+        """Both callers get a repository model from a single request."""
+        first, second = await asyncio.gather(
+            self.github.repos.get("owner/repo"),
+            self.github.repos.get("owner/repo"),
+        )
+        self.assertEqual(self.calls, ["/repos/owner/repo"])
+        for response in (first, second):
+            self.assertIsInstance(response.data, GitHubRepositoryModel)
+            self.assertEqual(response.data.full_name, "owner/repo")
+
+    async def test_releases(self) -> None:
+        """Both callers get release models from a single request."""
+        first, second = await asyncio.gather(
+            self.github.repos.releases.list("owner/repo"),
+            self.github.repos.releases.list("owner/repo"),
+        )
+        self.assertEqual(self.calls, ["/repos/owner/repo/releases"])
+        for response in (first, second):
+            self.assertIsInstance(response.data[0], GitHubReleaseModel)
+            self.assertEqual(response.data[0].tag_name, "v1.0.0")
+
+    async def test_tree(self) -> None:
+        """Both callers get a tree model from a single request."""
+        first, second = await asyncio.gather(
+            self.github.repos.git.get_tree("owner/repo", "main"),
+            self.github.repos.git.get_tree("owner/repo", "main"),
+        )
+        self.assertEqual(self.calls, ["/repos/owner/repo/git/trees/main"])
+        for response in (first, second):
+            self.assertIsInstance(response.data, GitHubGitTreeModel)
+            self.assertEqual(response.data.tree[0].path, "custom_plugins")
+
+    async def test_cancelled_callers(self) -> None:
+        """The shared request stops once every caller is cancelled."""
+        callers = [
+            asyncio.create_task(self.github.repos.get("owner/repo")) for _ in range(2)
+        ]
+        await asyncio.sleep(0.02)
+        self.assertEqual(len(self.github.inflight), 1)
+        (request,) = self.github.inflight.values()
+
+        callers[0].cancel()
+        await asyncio.sleep(0)
+        self.assertFalse(request.done())
+
+        callers[1].cancel()
+        await asyncio.gather(*callers, return_exceptions=True)
+        await asyncio.sleep(0)
+        self.assertTrue(request.done())
+        self.assertEqual(self.github.inflight, {})
+
+
+class TestFetchMetadata(unittest.IsolatedAsyncioTestCase):
+    """Plugin metadata is fetched from a fake GitHub API."""
+
+    async def asyncSetUp(self) -> None:
+        """Start a fake GitHub API server and isolate the manifest cache."""
+        self.tmp_dir = Path(self.enterContext(tempfile.TemporaryDirectory()))
+        self.enterContext(
+            patch(
+                "scripts.generate_metadata.MANIFEST_CACHE_DIR",
+                str(self.tmp_dir / "manifests"),
+            )
+        )
+        self.enterContext(
+            patch("scripts.generate_metadata.RATE_LIMIT_RETRY_DELAY", 0.1)
+        )
+        self.calls: list[str] = []
+        self.manifest: object = MANIFEST
+        self.truncated = False
+        self.rate_limited = 0
+        self.repository_delay = 0.0
+        self.releases_delay = 0.0
+        app = web.Application()
+        app.router.add_get("/repos/owner/repo", self.repository)
+        app.router.add_get("/repos/owner/repo/git/trees/{sha}", self.tree)
+        app.router.add_get("/repos/owner/repo/git/blobs/{sha}", self.blob)
+        app.router.add_get("/repos/owner/repo/releases", self.releases)
+        self.server = TestServer(app)
+        await self.server.start_server()
+        self.session = aiohttp.ClientSession()
+        self.github = self.client()
+
+    async def asyncTearDown(self) -> None:
+        """Stop the fake GitHub API server."""
+        await self.session.close()
+        await self.server.close()
+
+    def client(self, **kwargs: Any) -> RateLimitedGitHubAPI:
+        """Create a GitHub client talking to the fake server."""
+        return RateLimitedGitHubAPI(
+            session=self.session,
+            rate_limiter=RateLimiter(100, 1),
+            base_url=str(self.server.make_url("")).rstrip("/"),
+            **kwargs,
+        )
+
+    async def repository(self, request: web.Request) -> web.Response:
+        """Answer a repository request, rate limited while requested."""
+        self.calls.append(request.path)
+        await asyncio.sleep(self.repository_delay)
+        if self.rate_limited:
+            self.rate_limited -= 1
+            return web.json_response({"message": "API rate limit exceeded"}, status=403)
+        if request.headers.get("If-None-Match") == REPOSITORY_ETAG:
+            return web.Response(status=304)
+        return web.json_response(REPOSITORY, headers={"ETag": REPOSITORY_ETAG})
+
+    async def tree(self, request: web.Request) -> web.Response:
+        """Answer a git tree request, truncating the recursive root tree."""
+        self.calls.append(request.path_qs)
+        if request.match_info["sha"] == "plugins":
+            return web.json_response(PLUGINS_TREE)
+        if not self.truncated:
+            return web.json_response(RECURSIVE_TREE)
+        if "recursive" in request.query:
+            return web.json_response(TRUNCATED_TREE)
+        return web.json_response(ROOT_TREE)
+
+    async def blob(self, request: web.Request) -> web.Response:
+        """Answer a raw git blob request with the manifest."""
+        self.calls.append(request.path)
+        return web.json_response(
+            self.manifest, content_type="application/vnd.github.raw"
+        )
+
+    async def releases(self, request: web.Request) -> web.Response:
+        """Answer a release listing request."""
+        self.calls.append(request.path)
+        await asyncio.sleep(self.releases_delay)
+        if request.headers.get("If-None-Match") == RELEASES_ETAG:
+            return web.Response(status=304)
+        return web.json_response(RELEASES, headers={"ETag": RELEASES_ETAG})
+
+    async def test_metadata(self) -> None:
+        """The metadata combines the repository, manifest and releases."""
+        plugin = RotorHazardPlugin("owner/repo", FETCHED_AT)
+        status, (repo_id, metadata) = await plugin.fetch_metadata(self.github)
+        self.assertEqual(status, FetchStatus.OK)
+        self.assertEqual(repo_id, 1)
+        self.assertEqual(metadata["domain"], "demo")
+        self.assertEqual(metadata["last_version"], "v1.0.0")
+        self.assertEqual(metadata["etag_repository"], REPOSITORY_ETAG)
+        self.assertEqual(metadata["etag_release"], RELEASES_ETAG)
+
+    async def test_unchanged(self) -> None:
+        """An unchanged repository reuses the previous metadata."""
+        previous = {**PREVIOUS, "etag_release": RELEASES_ETAG}
+        plugin = RotorHazardPlugin("owner/repo", FETCHED_AT, (1, previous))
+        status, (repo_id, metadata) = await plugin.fetch_metadata(self.github)
+        self.assertEqual(status, FetchStatus.OK)
+        self.assertEqual(repo_id, 1)
+        self.assertEqual(metadata, {**previous, "last_fetched": FETCHED_AT})
+        self.assertEqual(
+            self.calls, ["/repos/owner/repo", "/repos/owner/repo/releases"]
+        )
+
+    async def test_new_release(self) -> None:
+        """A new release refreshes the metadata, listing the releases once."""
+        plugin = RotorHazardPlugin("owner/repo", FETCHED_AT, (1, PREVIOUS))
+        status, (_, metadata) = await plugin.fetch_metadata(self.github)
+        self.assertEqual(status, FetchStatus.OK)
+        self.assertEqual(metadata["last_version"], "v1.0.0")
+        self.assertEqual(metadata["last_fetched"], FETCHED_AT)
+        self.assertEqual(self.calls.count("/repos/owner/repo/releases"), 1)
+
+    async def test_truncated_tree(self) -> None:
+        """A truncated tree falls back to the `custom_plugins/` subtree."""
+        self.truncated = True
+        plugin = RotorHazardPlugin("owner/repo", FETCHED_AT)
+        status, (_, metadata) = await plugin.fetch_metadata(self.github)
+        self.assertEqual(status, FetchStatus.OK)
+        self.assertEqual(metadata["domain"], "demo")
+        self.assertIn("/repos/owner/repo/git/trees/main", self.calls)
+        self.assertIn("/repos/owner/repo/git/trees/plugins?recursive=1", self.calls)
+
+    async def test_rate_limit_retry(self) -> None:
+        """A rate limited request is retried once after pausing."""
+        self.rate_limited = 1
+        plugin = RotorHazardPlugin("owner/repo", FETCHED_AT)
+        status, _ = await plugin.fetch_metadata(self.github)
+        self.assertEqual(status, FetchStatus.OK)
+        self.assertEqual(self.calls.count("/repos/owner/repo"), 2)
+
+    async def test_rate_limit_exceeded(self) -> None:
+        """A request rate limited again after the retry is not handled."""
+        self.rate_limited = 2
+        plugin = RotorHazardPlugin("owner/repo", FETCHED_AT)
+        with self.assertRaises(RateLimitExceededError):
+            await plugin.fetch_metadata(self.github)
+
+    async def test_rate_limit_aborts_run(self) -> None:
+        """A run is aborted without output when the rate limit persists."""
+        self.rate_limited = 2
+        plugin_file = self.tmp_dir / "plugins.json"
+        plugin_file.write_text('["owner/repo"]')
+        output_dir = self.tmp_dir / "output"
+        base_url = str(self.server.make_url("")).rstrip("/")
+        self.enterContext(
+            patch(
+                "scripts.generate_metadata.RateLimitedGitHubAPI",
+                partial(RateLimitedGitHubAPI, base_url=base_url),
+            )
+        )
+        generator = MetadataGenerator(str(plugin_file), str(output_dir))
+        with self.assertRaises(RateLimitExceededError):
+            await generator.generate_metadata()
+        self.assertFalse((output_dir / "data.json").exists())
+
+    async def test_request_timeout(self) -> None:
+        """A hung request skips the plugin once the request times out."""
+        self.repository_delay = 0.5
+        github = self.client(timeout=0.1)
+        plugin = RotorHazardPlugin("owner/repo", FETCHED_AT)
+        status, payload = await plugin.fetch_metadata(github)
+        self.assertEqual(status, FetchStatus.SKIP)
+        self.assertIsNone(payload)
+
+    async def test_rate_limiter_wait(self) -> None:
+        """Waiting on the rate limiter does not count against the timeout."""
+        github = self.client(timeout=0.1)
+        github.rate_limiter.pause(0.2)
+        plugin = RotorHazardPlugin("owner/repo", FETCHED_AT)
+        status, _ = await plugin.fetch_metadata(github)
+        self.assertEqual(status, FetchStatus.OK)
+
+    async def test_failure_cancels_releases(self) -> None:
+        """A crash while validating the manifest stops the releases fetch."""
+        self.manifest = ["not", "a", "dict"]
+        self.releases_delay = 0.2
+        plugin = RotorHazardPlugin("owner/repo", FETCHED_AT)
+        with self.assertRaises(AttributeError):
+            await plugin.fetch_metadata(self.github)
+        await asyncio.sleep(self.releases_delay * 2)
+        events = [msg for msg, _ in plugin.events]
+        self.assertIn("Fetching releases", events)
+        self.assertNotIn("Latest stable release: %s", events)
+
+
+if __name__ == "__main__":
+    unittest.main()